@@ -1,7 +1,9 @@
 import os
+import re
 import sys
 import time
 import json
+import locale
 import socket
 import threading
 import subprocess
@@ -9,15 +11,15 @@ import queue
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
-# 可选 HTTP 健康检查
+# 可选更快的 JSON 解析
 try:
-    import requests
+    import orjson
 except ImportError:
-    requests = None  # 仅在 wait.type = http 时需要
+    orjson = None  # 未安装时使用标准库 json
 
 CONFIG_FILE = "services.json"
 
-# 日志队列
+# 日志队列；元素为单行字符串或多行列表（子进程输出按批投递）
 LOG_QUEUE = queue.Queue()
 STOP_EVENT = threading.Event()
 
@@ -30,6 +32,29 @@ STATUS_EXITED = "Exited"
 
 DEFAULT_START_INTERVAL = 5
 
+# load_config 解析结果缓存: path -> ((mtime_ns, size), (start_interval, services))
+_CONFIG_CACHE = {}
+
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+# 每次刷新日志最多处理的行数，避免大量输出时阻塞界面
+LOG_DRAIN_MAX_LINES = 500
+# 子进程输出攒够该行数或距上次投递超过该秒数即投递一批
+LOG_BATCH_LINES = 32
+LOG_BATCH_SECONDS = 0.1
+# 子进程输出按原始字节分块读取，投递前再按系统默认编码解码
+OUTPUT_READ_SIZE = 65536
+OUTPUT_ENCODING = locale.getpreferredencoding(False)
+# 行结束符与原 universal newlines 一致：\r\n、\r、\n
+OUTPUT_LINE_SPLIT_RE = re.compile(rb"\r\n|\r|\n")
+# 一直不换行的输出超过该字节数时强制作为一行投递，避免无限占用内存
+OUTPUT_MAX_LINE_BYTES = 65536
+
+# 日志高亮关键字
+LOG_ERR_RE = re.compile(r"error|failed|缺少|missing", re.IGNORECASE)
+LOG_WARN_RE = re.compile(r"warn", re.IGNORECASE)
+
 
 def script_dir():
     return os.path.dirname(
@@ -39,7 +64,7 @@ def script_dir():
 
 def load_config(path: str):
     """
-    读取并校验配置文件
+    读取并校验配置文件；文件未修改时直接返回上次的结果（调用方不应修改返回的对象）
     返回: (start_interval_seconds, services list)
     """
     if not os.path.isfile(path):
@@ -66,8 +91,15 @@ def load_config(path: str):
             f"未找到配置文件，已自动生成模板: {path} 请修改后重新启动。"
         )
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson else json.loads(raw.decode("utf-8"))
 
     if not isinstance(data, dict):
         raise ValueError("配置根对象必须是 JSON 对象 {}")
@@ -119,9 +151,34 @@ def load_config(path: str):
     if not isinstance(start_interval, int) or start_interval < 0:
         raise ValueError("'start_interval_seconds' 必须是非负整数")
 
+    _CONFIG_CACHE[path] = (stamp, (start_interval, services))
     return start_interval, services
 
 
+def _http_session():
+    """
+    可选 HTTP 健康检查：首次使用时才导入 requests（仅 wait.type = http 时需要）
+    返回全局共享的会话，跨探测/跨服务复用 TCP/TLS 连接；未安装 requests 时返回 None
+    """
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            try:
+                import requests
+                from requests.adapters import HTTPAdapter
+            except ImportError:
+                return None
+            import http.cookiejar
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            # 只共享连接池，不保存 Cookie：Cookie 不区分端口，否则会串到其他本地服务
+            session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            _HTTP_SESSION = session
+        return _HTTP_SESSION
+
+
 def utc_ts():
     return time.strftime("%H:%M:%S")
 
@@ -142,26 +199,59 @@ class ServiceRuntime:
         self.proc = None
         self.status = STATUS_IDLE
         self.restarts = 0
+        # 下一次重启前的等待秒数，每次重启后乘以退避因子
+        self._current_backoff = self.restart_backoff
         self._stdout_thread = None
         self._lock = threading.Lock()
-        self._stop_requested = False
+        # 停止请求标志；用 Event 以便等待中的线程立即被唤醒
+        self._stop_event = threading.Event()
+        # 子进程输出的待投递批次；单独加锁，log() 可能在持有 _lock 时被调用
+        self._log_batch = []
+        self._log_batch_time = time.monotonic()
+        self._log_lock = threading.Lock()
 
     def log(self, msg: str):
-        LOG_QUEUE.put(f"[{utc_ts()}][{self.name}] {msg}")
+        with self._log_lock:
+            # 先投递已缓存的输出，保持同一服务日志的先后顺序
+            self._flush_log_batch_locked()
+            LOG_QUEUE.put(f"[{utc_ts()}][{self.name}] {msg}")
+
+    def flush_log_batch(self):
+        with self._log_lock:
+            self._flush_log_batch_locked()
+
+    def _flush_log_batch_locked(self):
+        if self._log_batch:
+            LOG_QUEUE.put(self._log_batch)
+            self._log_batch = []
+        self._log_batch_time = time.monotonic()
+
+    def _log_output_bytes(self, lines):
+        # 各行已不含行结束符，拼接后一次解码
+        text = b"\n".join(lines).decode(OUTPUT_ENCODING, errors="replace")
+        self._log_output_lines(text.split("\n"))
+
+    def _log_output_lines(self, lines):
+        ts = utc_ts()
+        with self._log_lock:
+            # 每批最多 LOG_BATCH_LINES 行，保证 _drain_logs 的单次行数上限有效
+            for line in lines:
+                self._log_batch.append(f"[{ts}][{self.name}] {line}")
+                if len(self._log_batch) >= LOG_BATCH_LINES:
+                    self._flush_log_batch_locked()
+            if time.monotonic() - self._log_batch_time >= LOG_BATCH_SECONDS:
+                self._flush_log_batch_locked()
 
     def start(self):
         with self._lock:
             if self.proc and self.proc.poll() is None:
                 self.log("已在运行，忽略启动。")
                 return
-            self._stop_requested = False
+            self._stop_event.clear()
             self.status = STATUS_STARTING
 
         # 必要文件检查（若你已有就保留）
-        missing = []
-        for rf in self.required_files:
-            if not os.path.isfile(os.path.join(self.cwd, rf)):
-                missing.append(rf)
+        missing = self._missing_required_files()
         if missing:
             with self._lock:
                 self.status = STATUS_FAILED
@@ -186,9 +276,7 @@ class ServiceRuntime:
                 cwd=self.cwd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
+                bufsize=0,
                 creationflags=creationflags,
                 startupinfo=startupinfo,
             )
@@ -225,12 +313,58 @@ class ServiceRuntime:
         if self.status == STATUS_FAILED:
             self._maybe_schedule_restart()
 
+    def _missing_required_files(self):
+        """
+        一次 scandir 列出工作目录，代替逐个文件 stat
+        含目录部分的路径仍单独检查
+        """
+        if not self.required_files:
+            return []
+        try:
+            with os.scandir(self.cwd) as it:
+                present = {os.path.normcase(e.name) for e in it if e.is_file()}
+        except OSError:
+            present = set()
+        missing = []
+        for rf in self.required_files:
+            if os.path.dirname(rf):
+                found = os.path.isfile(os.path.join(self.cwd, rf))
+            else:
+                found = os.path.normcase(rf) in present
+            if not found:
+                missing.append(rf)
+        return missing
+
     def _read_stdout_loop(self):
         if not self.proc or not self.proc.stdout:
             return
-        for line in self.proc.stdout:
-            if line:
-                self.log(line.rstrip("\r\n"))
+        fd = self.proc.stdout.fileno()
+        # 尚未遇到行结束符的尾部
+        pending = bytearray()
+        # 上一块以 \r 结尾时，下一块开头的 \n 属于同一个 \r\n
+        skip_lf = False
+        while True:
+            try:
+                chunk = os.read(fd, OUTPUT_READ_SIZE)
+            except OSError:
+                break
+            if not chunk:
+                break
+            if skip_lf and chunk.startswith(b"\n"):
+                chunk = chunk[1:]
+            skip_lf = chunk.endswith(b"\r")
+            parts = OUTPUT_LINE_SPLIT_RE.split(chunk)
+            if len(parts) > 1:
+                parts[0] = bytes(pending) + parts[0]
+                pending.clear()
+                self._log_output_bytes(parts[:-1])
+            pending += parts[-1]
+            if len(pending) >= OUTPUT_MAX_LINE_BYTES:
+                self._log_output_bytes([bytes(pending)])
+                pending.clear()
+        if pending:
+            self._log_output_bytes([bytes(pending)])
+        self.flush_log_batch()
         code = self.proc.poll()
         if code is None:
             code = self.proc.wait()
@@ -250,51 +384,51 @@ class ServiceRuntime:
             port = int(self.wait_cfg.get("value"))
             self.log(f"等待端口 {port} (<= {timeout}s)")
             while time.time() - start < timeout:
-                if self._stop_requested:
+                if self._stop_event.is_set():
                     return False
                 if self.proc and self.proc.poll() is not None:
                     self.log(f"进程提前退出 code={self.proc.returncode}，停止等待端口。")
                     return False
                 if self._port_open(port):
                     return True
-                time.sleep(0.5)
+                if self._stop_event.wait(0.5):
+                    return False
             return False
         if wtype == "http":
-            if requests is None:
+            session = _http_session()
+            if session is None:
                 self.log("缺少 requests 库，无法进行 HTTP 健康检查。")
                 return False
             url = self.wait_cfg.get("value")
             self.log(f"等待 HTTP {url} (<= {timeout}s)")
             while time.time() - start < timeout:
-                if self._stop_requested:
+                if self._stop_event.is_set():
                     return False
                 if self.proc and self.proc.poll() is not None:
                     self.log(f"进程提前退出 code={self.proc.returncode}，停止等待 HTTP。")
                     return False
                 try:
-                    r = requests.get(url, timeout=2)
+                    r = session.get(url, timeout=2)
                     if r.status_code < 400:
                         return True
                 except Exception:
                     pass
-                time.sleep(0.5)
+                if self._stop_event.wait(0.5):
+                    return False
             return False
         self.log(f"未知 wait.type={wtype}，跳过。")
         return True
 
     def _port_open(self, port: int) -> bool:
-        s = socket.socket()
-        s.settimeout(0.4)
         try:
-            s.connect(("127.0.0.1", port))
-            s.close()
-            return True
-        except Exception:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.4):
+                return True
+        except OSError:
             return False
 
     def stop(self, force=True):
         with self._lock:
-            self._stop_requested = True
+            self._stop_event.set()
         self._terminate_internal(force=force)
         with self._lock:
             if self.status not in (STATUS_FAILED, STATUS_EXITED):
@@ -319,24 +453,22 @@ class ServiceRuntime:
                     pass
 
     def _maybe_schedule_restart(self):
-        if not self.auto_restart or self._stop_requested or STOP_EVENT.is_set():
+        if not self.auto_restart or self._stop_event.is_set() or STOP_EVENT.is_set():
             return
         if self.max_restarts >= 0 and self.restarts >= self.max_restarts:
             self.log("已达到最大重启次数，不再重启。")
             return
         self.restarts += 1
-        delay = self.restart_backoff * (self.restart_backoff_factor ** (self.restarts - 1))
+        delay = self._current_backoff
+        self._current_backoff *= self.restart_backoff_factor
         self.log(f"计划第 {self.restarts} 次重启，{delay:.1f}s 后执行。")
         threading.Thread(target=self._delayed_restart, args=(delay,), daemon=True).start()
 
     def _delayed_restart(self, delay):
-        t0 = time.time()
-        while time.time() - t0 < delay:
-            if self._stop_requested or STOP_EVENT.is_set():
-                return
-            time.sleep(0.2)
-        if not self._stop_requested and not STOP_EVENT.is_set():
-            self.start()
+        # 关闭窗口时 on_close 会对每个服务调用 stop()，同样会唤醒这里
+        if self._stop_event.wait(delay) or STOP_EVENT.is_set():
+            return
+        self.start()
 
 
 class LauncherGUI:
@@ -348,6 +480,8 @@ class LauncherGUI:
         self.start_interval_seconds, services_specs = self._safe_load_config(initial=True)
         self.services = [ServiceRuntime(s) for s in services_specs]
         self.service_map = {s.name: s for s in self.services}
+        # 状态表每行最近一次写入的值，未变化时跳过刷新
+        self._last_row = {}
 
         self._build_widgets()
         self._populate_tree()
@@ -418,6 +552,7 @@ class LauncherGUI:
         # 清空旧
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self._last_row.clear()
         for s in self.services:
             self.tree.insert("", "end", iid=s.name, values=(s.name, s.status, "-", 0))
 
@@ -437,10 +572,8 @@ class LauncherGUI:
             svc.start()
             if i < len(self.services) - 1 and self.start_interval_seconds > 0:
                 svc.log(f"等待 {self.start_interval_seconds} 秒再启动下一个服务...")
-                for _ in range(self.start_interval_seconds):
-                    if STOP_EVENT.is_set():
-                        return
-                    time.sleep(1)
+                if STOP_EVENT.wait(self.start_interval_seconds):
+                    return
         self.status_var.set("全部启动流程结束。")
 
     def stop_all(self):
@@ -517,39 +650,64 @@ class LauncherGUI:
             pid = "-"
             if svc.proc and svc.proc.poll() is None:
                 pid = str(svc.proc.pid)
+            row = (svc.status, pid, svc.restarts)
+            if self._last_row.get(svc.name) == row:
+                continue
             if self.tree.exists(svc.name):
-                self.tree.set(svc.name, "status", svc.status)
-                self.tree.set(svc.name, "pid", pid)
-                self.tree.set(svc.name, "restarts", svc.restarts)
+                self.tree.item(svc.name, values=(svc.name,) + row)
+                self._last_row[svc.name] = row
 
     def _schedule_log_drain(self):
-        self._drain_logs()
-        self.root.after(250, self._schedule_log_drain)
+        more = self._drain_logs()
+        # 队列未取完时尽快继续，否则按常规间隔轮询
+        self.root.after(1 if more else 250, self._schedule_log_drain)
 
     def _drain_logs(self):
-        updated = False
+        """
+        批量取出日志，合并为一次 Text.insert 调用
+        返回: 队列中是否可能仍有未取出的日志
+        """
+        # insert 参数: 文本, 标签, 文本, 标签 ...；相邻同标签的行合并为一段
+        segments = []
+        chunk = []
+        chunk_tag = None
+        count = 0
+        # 读取线程阻塞等待输出时，由这里把尾部不足一批的行投递出去
+        for svc in self.services:
+            svc.flush_log_batch()
+        # 每个队列元素最多 LOG_BATCH_LINES 行，留足余量以保证不超过上限
+        more = False
         while True:
+            if count + LOG_BATCH_LINES > LOG_DRAIN_MAX_LINES:
+                more = True
+                break
             try:
-                line = LOG_QUEUE.get_nowait()
+                item = LOG_QUEUE.get_nowait()
             except queue.Empty:
                 break
-            updated = True
-            self._append_log_line(line)
-        if updated:
+            lines = item if isinstance(item, list) else (item,)
+            for line in lines:
+                count += 1
+                line = line.rstrip("\r\n")
+                tag = self._log_tag(line)
+                if chunk and tag != chunk_tag:
+                    segments += ["".join(chunk), chunk_tag or ""]
+                    chunk = []
+                chunk_tag = tag
+                chunk.append(line + "\n")
+        if chunk:
+            segments += ["".join(chunk), chunk_tag or ""]
+        if segments:
+            self.txt.insert("end", *segments)
             self.txt.see("end")
-
-    def _append_log_line(self, line: str):
-        line = line.rstrip("\r\n")
-        lower = line.lower()
-        tag = None
-        if any(k in lower for k in ("error", "failed", "缺少", "missing")):
-            tag = "err"
-        elif "warn" in lower:
-            tag = "warn"
-        if tag:
-            self.txt.insert("end", line + "\n", tag)
-        else:
-            self.txt.insert("end", line + "\n")
+        return more
+
+    def _log_tag(self, line: str):
+        if LOG_ERR_RE.search(line):
+            return "err"
+        if LOG_WARN_RE.search(line):
+            return "warn"
+        return None
 
     # ------------------- 关闭事件 -------------------
 